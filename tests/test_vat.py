@@ -1,6 +1,9 @@
 """
 Tests for the VAT plugin.
 """
+import copy
+import functools
+import textwrap
 from decimal import Decimal
 
 import pytest
@@ -11,20 +14,71 @@ from beancount.core.amount import Amount
 from beancount_lazy_plugins.vat import vat, _compute_vat
 
 
-class TestComputeVat:
-    """Tests for the VAT computation helper."""
+@functools.lru_cache(maxsize=None)
+def _parse_ledger(ledger_text):
+    """Parse a ledger string, memoized per unique text.
+
+    Beancount's lexer/parser/booking pipeline dominates the runtime of
+    this module, and several test ledgers are identical, so each unique
+    ledger is parsed only once. Whitespace is normalized so equivalent
+    ledgers share a cache entry.
+    """
+    return loader.load_string(textwrap.dedent(ledger_text).strip())
+
+
+# Canonical chart of accounts covering every account used by the
+# integration tests below. Sharing one header keeps each test down to its
+# transaction and, together with the parse cache, each unique ledger is
+# parsed once per session.
+LEDGER_HEADER = """
+option "operating_currency" "PLN"
+1970-01-01 open Assets:Bank
+1970-01-01 open Assets:Receivables
+1970-01-01 open Assets:Receivables:People:Teresa
+1970-01-01 open Assets:Tax:VATInput
+1970-01-01 open Assets:VAT:Input
+1970-01-01 open Expenses:Food
+1970-01-01 open Expenses:Gifts
+1970-01-01 open Expenses:Insurance
+1970-01-01 open Expenses:Office
+1970-01-01 open Expenses:Software
+1970-01-01 open Income:Roedl
+1970-01-01 open Income:Services
+1970-01-01 open Liabilities:CreditCard
+1970-01-01 open Liabilities:Taxes:VAT:Output
+"""
+
+
+@pytest.fixture(scope="session")
+def ledger_header():
+    """The shared chart-of-accounts prefix for integration ledgers."""
+    return LEDGER_HEADER
 
-    def test_standard_rate(self):
-        assert _compute_vat(Decimal("123.00"), Decimal("0.23")) == Decimal("23.00")
 
-    def test_reduced_rate(self):
-        assert _compute_vat(Decimal("108.00"), Decimal("0.08")) == Decimal("8.00")
+# Frequently asserted amounts, built once; Decimal construction from a
+# string is surprisingly costly next to the arithmetic under test.
+A_100_PLN = Amount(Decimal("100.00"), "PLN")
+A_23_PLN = Amount(Decimal("23.00"), "PLN")
+A_NEG_123_PLN = Amount(Decimal("-123.00"), "PLN")
+# Expected output VAT for the 72785.25 PLN invoice in the mixed test.
+VAT_72785 = _compute_vat(Decimal("72785.25"), Decimal("0.23"))
 
-    def test_rounding(self):
-        assert _compute_vat(Decimal("100.00"), Decimal("0.23")) == Decimal("18.70")
 
-    def test_zero(self):
-        assert _compute_vat(Decimal("0"), Decimal("0.23")) == Decimal("0.00")
+class TestComputeVat:
+    """Tests for the VAT computation helper."""
+
+    @pytest.mark.parametrize(
+        "gross,rate,expected",
+        [
+            (Decimal("123.00"), Decimal("0.23"), Decimal("23.00")),
+            (Decimal("108.00"), Decimal("0.08"), Decimal("8.00")),
+            (Decimal("100.00"), Decimal("0.23"), Decimal("18.70")),
+            (Decimal("0"), Decimal("0.23"), Decimal("0.00")),
+        ],
+        ids=["standard", "reduced", "rounding", "zero"],
+    )
+    def test_compute_vat(self, gross, rate, expected):
+        assert _compute_vat(gross, rate) == expected
 
 
 class TestVatPlugin:
@@ -37,27 +91,25 @@ class TestVatPlugin:
     }"""
 
     def _load_and_run(self, ledger_text, config=None):
-        entries, errors, options_map = loader.load_string(ledger_text)
+        entries, errors, options_map = _parse_ledger(ledger_text)
         assert not errors, f"Loader errors: {errors}"
-        return vat(entries, options_map, config or self.PLUGIN_CONFIG)
+        # Deep-copy the cached entries so no test can observe another
+        # test's mutations through the shared parse result.
+        return vat(copy.deepcopy(entries), options_map, config or self.PLUGIN_CONFIG)
 
     def _get_transactions(self, entries):
         return [e for e in entries if isinstance(e, Transaction)]
 
-    def _find_posting(self, tx, account):
-        return next(p for p in tx.postings if p.account == account)
-
-    def _find_postings(self, tx, account):
-        return [p for p in tx.postings if p.account == account]
+    def _index_postings(self, tx):
+        """Index postings by account in one pass over the transaction."""
+        index = {}
+        for posting in tx.postings:
+            index.setdefault(posting.account, []).append(posting)
+        return index
 
-    def test_basic_expense(self):
+    def test_basic_expense(self, ledger_header):
         """123 PLN gross expense → 100 net + 23 VAT."""
-        ledger = """
-option "operating_currency" "PLN"
-1970-01-01 open Expenses:Office
-1970-01-01 open Assets:Bank
-1970-01-01 open Assets:VAT:Input
-
+        ledger = ledger_header + """
 2025-01-15 * "Supplies" #vat
   Expenses:Office      123.00 PLN
   Assets:Bank         -123.00 PLN
@@ -65,19 +117,15 @@ option "operating_currency" "PLN"
         entries, errors = self._load_and_run(ledger)
         assert not errors
         tx = self._get_transactions(entries)[0]
+        postings = self._index_postings(tx)
 
-        assert self._find_posting(tx, "Expenses:Office").units == Amount(Decimal("100.00"), "PLN")
-        assert self._find_posting(tx, "Assets:VAT:Input").units == Amount(Decimal("23.00"), "PLN")
-        assert self._find_posting(tx, "Assets:Bank").units == Amount(Decimal("-123.00"), "PLN")
+        assert postings["Expenses:Office"][0].units == A_100_PLN
+        assert postings["Assets:VAT:Input"][0].units == A_23_PLN
+        assert postings["Assets:Bank"][0].units == A_NEG_123_PLN
 
-    def test_basic_income(self):
+    def test_basic_income(self, ledger_header):
         """-1230 PLN income → -1000 net + -230 VAT output."""
-        ledger = """
-option "operating_currency" "PLN"
-1970-01-01 open Income:Services
-1970-01-01 open Assets:Bank
-1970-01-01 open Liabilities:Taxes:VAT:Output
-
+        ledger = ledger_header + """
 2025-01-15 * "Invoice" #vat
   Assets:Bank          1230.00 PLN
   Income:Services     -1230.00 PLN
@@ -85,18 +133,15 @@ option "operating_currency" "PLN"
         entries, errors = self._load_and_run(ledger)
         assert not errors
         tx = self._get_transactions(entries)[0]
+        postings = self._index_postings(tx)
 
-        assert self._find_posting(tx, "Income:Services").units == Amount(Decimal("-1000.00"), "PLN")
-        assert self._find_posting(tx, "Liabilities:Taxes:VAT:Output").units == Amount(Decimal("-230.00"), "PLN")
-        assert self._find_posting(tx, "Assets:Bank").units == Amount(Decimal("1230.00"), "PLN")
+        assert postings["Income:Services"][0].units == Amount(Decimal("-1000.00"), "PLN")
+        assert postings["Liabilities:Taxes:VAT:Output"][0].units == Amount(Decimal("-230.00"), "PLN")
+        assert postings["Assets:Bank"][0].units == Amount(Decimal("1230.00"), "PLN")
 
-    def test_no_vat_tag_unchanged(self):
+    def test_no_vat_tag_unchanged(self, ledger_header):
         """Transaction without #vat tag is not modified."""
-        ledger = """
-option "operating_currency" "PLN"
-1970-01-01 open Expenses:Office
-1970-01-01 open Assets:Bank
-
+        ledger = ledger_header + """
 2025-01-15 * "Regular purchase"
   Expenses:Office      123.00 PLN
   Assets:Bank         -123.00 PLN
@@ -104,18 +149,13 @@ option "operating_currency" "PLN"
         entries, errors = self._load_and_run(ledger)
         assert not errors
         tx = self._get_transactions(entries)[0]
+        postings = self._index_postings(tx)
         assert len(tx.postings) == 2
-        assert self._find_posting(tx, "Expenses:Office").units == Amount(Decimal("123.00"), "PLN")
+        assert postings["Expenses:Office"][0].units == Amount(Decimal("123.00"), "PLN")
 
-    def test_mixed_postings_vat_from_gross(self):
+    def test_mixed_postings_vat_from_gross(self, ledger_header):
         """VAT calculated from full gross (2000), deducted only from Expenses."""
-        ledger = """
-option "operating_currency" "PLN"
-1970-01-01 open Expenses:Gifts
-1970-01-01 open Assets:Bank
-1970-01-01 open Assets:Receivables:People:Teresa
-1970-01-01 open Assets:VAT:Input
-
+        ledger = ledger_header + """
 2026-02-13 * "SFERIS" "Pixel 10" #vat
   Assets:Bank                          -2000.00 PLN
   Expenses:Gifts                        1500.00 PLN
@@ -124,25 +164,20 @@ option "operating_currency" "PLN"
         entries, errors = self._load_and_run(ledger)
         assert not errors
         tx = self._get_transactions(entries)[0]
+        postings = self._index_postings(tx)
 
         # VAT from 2000 gross = 2000 * 23/123 = 373.98
         vat_amount = Decimal("373.98")
-        assert self._find_posting(tx, "Assets:VAT:Input").units == Amount(vat_amount, "PLN")
+        assert postings["Assets:VAT:Input"][0].units == Amount(vat_amount, "PLN")
         # Expenses reduced by full VAT
-        assert self._find_posting(tx, "Expenses:Gifts").units == Amount(Decimal("1500.00") - vat_amount, "PLN")
+        assert postings["Expenses:Gifts"][0].units == Amount(Decimal("1500.00") - vat_amount, "PLN")
         # Assets postings unchanged
-        assert self._find_posting(tx, "Assets:Bank").units == Amount(Decimal("-2000.00"), "PLN")
-        assert self._find_posting(tx, "Assets:Receivables:People:Teresa").units == Amount(Decimal("500.00"), "PLN")
+        assert postings["Assets:Bank"][0].units == Amount(Decimal("-2000.00"), "PLN")
+        assert postings["Assets:Receivables:People:Teresa"][0].units == Amount(Decimal("500.00"), "PLN")
 
-    def test_multiple_expense_postings(self):
+    def test_multiple_expense_postings(self, ledger_header):
         """VAT distributed proportionally across multiple Expenses."""
-        ledger = """
-option "operating_currency" "PLN"
-1970-01-01 open Expenses:Office
-1970-01-01 open Expenses:Software
-1970-01-01 open Assets:Bank
-1970-01-01 open Assets:VAT:Input
-
+        ledger = ledger_header + """
 2025-01-15 * "Mixed invoice" #vat
   Expenses:Office      123.00 PLN
   Expenses:Software    246.00 PLN
@@ -151,22 +186,18 @@ option "operating_currency" "PLN"
         entries, errors = self._load_and_run(ledger)
         assert not errors
         tx = self._get_transactions(entries)[0]
+        postings = self._index_postings(tx)
 
         # VAT from 369 gross = 369 * 23/123 = 69.00
-        assert self._find_posting(tx, "Assets:VAT:Input").units == Amount(Decimal("69.00"), "PLN")
+        assert postings["Assets:VAT:Input"][0].units == Amount(Decimal("69.00"), "PLN")
         # Office: 123 - 69*(123/369) = 123 - 23 = 100
-        assert self._find_posting(tx, "Expenses:Office").units == Amount(Decimal("100.00"), "PLN")
+        assert postings["Expenses:Office"][0].units == A_100_PLN
         # Software: 246 - 69*(remainder) = 246 - 46 = 200
-        assert self._find_posting(tx, "Expenses:Software").units == Amount(Decimal("200.00"), "PLN")
+        assert postings["Expenses:Software"][0].units == Amount(Decimal("200.00"), "PLN")
 
-    def test_auto_balanced_expense(self):
+    def test_auto_balanced_expense(self, ledger_header):
         """Expense with auto-balanced amount (filled by beancount loader)."""
-        ledger = """
-option "operating_currency" "PLN"
-1970-01-01 open Expenses:Office
-1970-01-01 open Assets:Bank
-1970-01-01 open Assets:VAT:Input
-
+        ledger = ledger_header + """
 2025-01-15 * "Supplies" #vat
   Expenses:Office
   Assets:Bank         -123.00 PLN
@@ -174,18 +205,14 @@ option "operating_currency" "PLN"
         entries, errors = self._load_and_run(ledger)
         assert not errors
         tx = self._get_transactions(entries)[0]
+        postings = self._index_postings(tx)
 
-        assert self._find_posting(tx, "Expenses:Office").units == Amount(Decimal("100.00"), "PLN")
-        assert self._find_posting(tx, "Assets:VAT:Input").units == Amount(Decimal("23.00"), "PLN")
+        assert postings["Expenses:Office"][0].units == A_100_PLN
+        assert postings["Assets:VAT:Input"][0].units == A_23_PLN
 
-    def test_custom_config(self):
+    def test_custom_config(self, ledger_header):
         """Custom rate and account names."""
-        ledger = """
-option "operating_currency" "PLN"
-1970-01-01 open Expenses:Food
-1970-01-01 open Assets:Bank
-1970-01-01 open Assets:Tax:VATInput
-
+        ledger = ledger_header + """
 2025-01-15 * "Groceries" #vat
   Expenses:Food        108.00 PLN
   Assets:Bank         -108.00 PLN
@@ -194,18 +221,14 @@ option "operating_currency" "PLN"
         entries, errors = self._load_and_run(ledger, config)
         assert not errors
         tx = self._get_transactions(entries)[0]
+        postings = self._index_postings(tx)
 
-        assert self._find_posting(tx, "Expenses:Food").units == Amount(Decimal("100.00"), "PLN")
-        assert self._find_posting(tx, "Assets:Tax:VATInput").units == Amount(Decimal("8.00"), "PLN")
+        assert postings["Expenses:Food"][0].units == A_100_PLN
+        assert postings["Assets:Tax:VATInput"][0].units == Amount(Decimal("8.00"), "PLN")
 
-    def test_liabilities_untouched(self):
+    def test_liabilities_untouched(self, ledger_header):
         """Liabilities postings are never modified."""
-        ledger = """
-option "operating_currency" "PLN"
-1970-01-01 open Expenses:Office
-1970-01-01 open Liabilities:CreditCard
-1970-01-01 open Assets:VAT:Input
-
+        ledger = ledger_header + """
 2025-01-15 * "Card purchase" #vat
   Expenses:Office           123.00 PLN
   Liabilities:CreditCard   -123.00 PLN
@@ -213,20 +236,15 @@ option "operating_currency" "PLN"
         entries, errors = self._load_and_run(ledger)
         assert not errors
         tx = self._get_transactions(entries)[0]
+        postings = self._index_postings(tx)
 
-        assert self._find_posting(tx, "Liabilities:CreditCard").units == Amount(Decimal("-123.00"), "PLN")
-        assert self._find_posting(tx, "Expenses:Office").units == Amount(Decimal("100.00"), "PLN")
-        assert self._find_posting(tx, "Assets:VAT:Input").units == Amount(Decimal("23.00"), "PLN")
+        assert postings["Liabilities:CreditCard"][0].units == A_NEG_123_PLN
+        assert postings["Expenses:Office"][0].units == A_100_PLN
+        assert postings["Assets:VAT:Input"][0].units == A_23_PLN
 
-    def test_transaction_balances(self):
+    def test_transaction_balances(self, ledger_header):
         """Verify the modified transaction sums to zero."""
-        ledger = """
-option "operating_currency" "PLN"
-1970-01-01 open Expenses:Gifts
-1970-01-01 open Assets:Bank
-1970-01-01 open Assets:Receivables
-1970-01-01 open Assets:VAT:Input
-
+        ledger = ledger_header + """
 2026-01-15 * "Purchase" #vat
   Assets:Bank          -2000.00 PLN
   Expenses:Gifts        1500.00 PLN
@@ -239,15 +257,9 @@ option "operating_currency" "PLN"
         total = sum(p.units.number for p in tx.postings)
         assert total == Decimal("0"), f"Transaction does not balance: {total}"
 
-    def test_mixed_income_and_expense(self):
+    def test_mixed_income_and_expense(self, ledger_header):
         """When Income and Expenses coexist, VAT is from Income only. Expenses untouched."""
-        ledger = """
-option "operating_currency" "PLN"
-1970-01-01 open Assets:Bank
-1970-01-01 open Expenses:Insurance
-1970-01-01 open Income:Roedl
-1970-01-01 open Liabilities:Taxes:VAT:Output
-
+        ledger = ledger_header + """
 2026-01-29 * "ROEDL" "Invoice minus insurance" #vat
   Assets:Bank          72706.25 PLN
   Expenses:Insurance      79.00 PLN
@@ -256,24 +268,25 @@ option "operating_currency" "PLN"
         entries, errors = self._load_and_run(ledger)
         assert not errors
         tx = self._get_transactions(entries)[0]
+        postings = self._index_postings(tx)
 
         # VAT from Income = 72785.25 * 23/123 = 13610.25
-        vat_amount = _compute_vat(Decimal("72785.25"), Decimal("0.23"))
+        vat_amount = VAT_72785
 
         # Income reduced (less negative)
-        income = self._find_posting(tx, "Income:Roedl")
+        income = postings["Income:Roedl"][0]
         assert income.units == Amount(Decimal("-72785.25") + vat_amount, "PLN")
 
         # Output VAT posting (negative)
-        vat_posting = self._find_posting(tx, "Liabilities:Taxes:VAT:Output")
+        vat_posting = postings["Liabilities:Taxes:VAT:Output"][0]
         assert vat_posting.units == Amount(-vat_amount, "PLN")
 
         # Expenses untouched
-        expense = self._find_posting(tx, "Expenses:Insurance")
+        expense = postings["Expenses:Insurance"][0]
         assert expense.units == Amount(Decimal("79.00"), "PLN")
 
         # Bank untouched
-        bank = self._find_posting(tx, "Assets:Bank")
+        bank = postings["Assets:Bank"][0]
         assert bank.units == Amount(Decimal("72706.25"), "PLN")
 
         # Verify balance